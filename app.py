@@ -1,26 +1,140 @@
 import streamlit as st
 import numpy as np
-import pandas as pd
-import joblib
+import pyarrow as pa
+import pyarrow.dataset as ds
+import json
+import onnxruntime as ort
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# choices for the dropdowns, sorted once at import instead of on every rerun
+FLAT_TYPES = ["1 ROOM", "2 ROOM", "3 ROOM", "4 ROOM", "5 ROOM", "EXECUTIVE", "MULTI-GENERATION"]
+TOWNS = sorted([
+    "ANG MO KIO", "BEDOK", "BISHAN", "BUKIT BATOK", "BUKIT MERAH", "BUKIT PANJANG",
+    "BUKIT TIMAH", "CENTRAL AREA", "CHOA CHU KANG", "CLEMENTI", "GEYLANG", "HOUGANG",
+    "JURONG EAST", "JURONG WEST", "KALLANG/WHAMPOA", "MARINE PARADE", "PASIR RIS",
+    "PUNGGOL", "QUEENSTOWN", "SEMBAWANG", "SENGKANG", "SERANGOON", "TAMPINES",
+    "TOA PAYOH", "WOODLANDS", "YISHUN"
+])
+FLAT_MODELS = sorted([
+    "Improved", "New Generation", "Simplified", "Premium Apartment", "Maisonette", 
+    "Apartment", "Adjoined flat", "Type S1", "Type S2", "Standard", "DBSS", "Terrace", 
+    "2-room"
+])
+
+
+# load the trained model. This is the ONNX export (see convert_to_onnx.py) of a
+# small LightGBM model distilled from the original RandomForest (see
+# distill_model.py). Along with it comes the position of each model feature,
+# keyed by name for the numeric inputs and by (field, value) for the one-hot
+# encoded choices, so the input row can be filled in directly
+def load_model():
+    model = ort.InferenceSession('model.onnx', providers=['CPUExecutionProvider'])
+    feature_names = json.loads(model.get_modelmeta().custom_metadata_map['feature_names'])
+    feat_index = {}
+    for i, name in enumerate(feature_names):
+        feat_index[name] = i
+        for field in ('town', 'flat_type', 'flat_model'):
+            if name.startswith(f'{field}_'):
+                feat_index[(field, name[len(field) + 1:])] = i
+    return model, len(feature_names), feat_index
+
+
+# open the historical HDB transactions, a Parquet dataset partitioned by town
+# (see convert_to_parquet.py); this only lists the files, nothing is read yet
+def load_hdb():
+    return ds.dataset('hdb_ds', format='parquet', partitioning='hive')
+
+
+# start loading the model and opening the transactions in the background once
+# per process, so the two overlap and the page starts rendering straight away;
+# each is only waited on where it is first needed
+@st.cache_resource(show_spinner=False)
+def start_loading():
+    executor = ThreadPoolExecutor(max_workers=2)
+    futures = executor.submit(load_model), executor.submit(load_hdb)
+    executor.shutdown(wait=False)
+    return futures
+
+
+model_future, hdb_future = start_loading()
+
+
+# wait for a background load. A failed load is dropped from the cache so the
+# next rerun starts it again, instead of every rerun re-raising the same error
+def wait_for(future):
+    if future.exception() is not None:
+        start_loading.clear()
+    return future.result()
+
+
+# read the custom CSS file once instead of on every rerun
+@st.cache_data(show_spinner=False)
+def load_css():
+    with open("styles.css") as f:
+        return f.read()
+
+
 # loading the custom CSS styles to make the app look nice
-with open("styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # setting up the page config (title, icon, and layout)
 st.set_page_config(page_title="HDB Resale Price Predictor", page_icon="🏠", layout="wide")
 
 
-model = joblib.load('randomforestmodel.joblib')
+# 5 most recent transactions for a town, built straight into the Arrow table
+# st.dataframe sends to the browser with prices formatted as whole dollars.
+# The town filter is pushed down to the dataset so only that town's files and
+# the displayed columns are read, and each town is only read once
+@st.cache_data(show_spinner=False)
+def recent_transactions(town):
+    recent = (
+        wait_for(hdb_future)
+        .to_table(
+            filter=(ds.field('town') == town) & ds.field('month').is_valid(),
+            columns=['month', 'block', 'street_name', 'flat_model', 'flat_type',
+                     'floor_area_sqm', 'resale_price']
+        )
+        .sort_by([('month', 'descending')])
+        .slice(0, 5)
+    )
+    if recent.num_rows == 0:
+        return None
+    return pa.table({
+        'Block': recent['block'],
+        'Street': recent['street_name'],
+        'Model': recent['flat_model'],
+        'Type': recent['flat_type'],
+        'Area (sqm)': recent['floor_area_sqm'],
+        'Resale Price': pa.array([f"${p:,}" for p in recent['resale_price'].to_pylist()])
+    })
+
+
+# predict a single flat's price, remembering recent inputs so clicking
+# predict again with the same details skips the model entirely
+@st.cache_data(show_spinner=False, max_entries=1024)
+def predict_price(floor_area, flat_age, remaining_lease_years, flat_type, town, flat_model):
+    model, n_features, feat_index = wait_for(model_future)
+    # gather input data for prediction as a single float32 row in model
+    # feature order, which is exactly what the model takes
+    X = np.zeros((1, n_features), dtype=np.float32)
+    X[0, feat_index['floor_area_sqm']] = floor_area
+    X[0, feat_index['flat_age']] = flat_age
+    X[0, feat_index['remaining_lease_years']] = remaining_lease_years
+    # one-hot encoded choices (the dropped first category has no column)
+    for key in (('town', town), ('flat_type', flat_type), ('flat_model', flat_model)):
+        if key in feat_index:
+            X[0, feat_index[key]] = 1
+    return float(model.run(None, {'X': X})[0][0, 0])
+
 
 # --- custom banner with gradient background ---
-st.markdown("""
+st.html("""
 <div class="gradient-banner">
     <h1>🏠 HDB Resale Price Predictor</h1>
     <p>Get instant estimates for your HDB flat resale value with AI-powered predictions</p>
 </div>
-""", unsafe_allow_html=True)
+""")
 
 # --- Property details section ---
 st.markdown('<div class="section-title">🏡 Property Details</div>', unsafe_allow_html=True)
@@ -33,70 +147,35 @@ with col1:
     )
     # dropdown to select flat type
     flat_type = st.selectbox(
-        "Flat Type", ["1 ROOM", "2 ROOM", "3 ROOM", "4 ROOM", "5 ROOM", "EXECUTIVE", "MULTI-GENERATION"],
+        "Flat Type", FLAT_TYPES,
         help="Select your HDB flat type"
     )
 with col2:
     # dropdown to select town where the flat is located
     town = st.selectbox(
-        "Town", sorted([
-            "ANG MO KIO", "BEDOK", "BISHAN", "BUKIT BATOK", "BUKIT MERAH", "BUKIT PANJANG",
-            "BUKIT TIMAH", "CENTRAL AREA", "CHOA CHU KANG", "CLEMENTI", "GEYLANG", "HOUGANG",
-            "JURONG EAST", "JURONG WEST", "KALLANG/WHAMPOA", "MARINE PARADE", "PASIR RIS",
-            "PUNGGOL", "QUEENSTOWN", "SEMBAWANG", "SENGKANG", "SERANGOON", "TAMPINES",
-            "TOA PAYOH", "WOODLANDS", "YISHUN"
-        ]),
+        "Town", TOWNS,
         help="Select the town where your flat is located"
     )
     # dropdown to select flat model
     flat_model = st.selectbox(
-        "Flat Model", sorted([
-            "Improved", "New Generation", "Simplified", "Premium Apartment", "Maisonette", 
-            "Apartment", "Adjoined flat", "Type S1", "Type S2", "Standard", "DBSS", "Terrace", 
-            "2-room"
-        ]),
+        "Flat Model", FLAT_MODELS,
         help="Select your flat model type"
     )
 
     # --- Show recent transactions for selected town in a dropdown ---
 
-# Load historical data about HDB transactions
-df_hdb = pd.read_csv('hdb.csv')
-
-# Ensure 'month' column is parsed as datetime for easy sorting
-df_hdb['month'] = pd.to_datetime(df_hdb['month'], errors='coerce')
+# Look up the 5 most recent transactions for selected town
+recent = recent_transactions(town)
 
-# Filter and show 5 most recent transactions for selected town
-recent = (
-    df_hdb[df_hdb['town'] == town]
-    .dropna(subset=['month'])
-    .sort_values('month', ascending=False)
-    .head(5)
-)
-
-if not recent.empty:
+if recent is not None:
     with st.expander(f"🕵️‍♂️ Most Recent Transactions in {town}", expanded=False):
         st.markdown(
             "<div class='recent-transactions-title'>Most Recent HDB Transactions:</div>",
             unsafe_allow_html=True
         )
-        # Process and display relevant data
-        recent_display = (
-            recent[['block', 'street_name', 'flat_model', 'flat_type', 'floor_area_sqm', 'resale_price']]
-            .rename(columns={
-                'block': 'Block',
-                'street_name': 'Street',
-                'flat_model': 'Model',
-                'flat_type': 'Type',
-                'floor_area_sqm': 'Area (sqm)',
-                'resale_price': 'Resale Price'
-            })
-            .reset_index(drop=True)
-        )
-        # Format price and show data
-        recent_display['Resale Price'] = recent_display['Resale Price'].apply(lambda x: f"${int(x):,}")
+        # show the prebuilt display table
         st.dataframe(
-            recent_display,
+            recent,
             hide_index=True,
             use_container_width=True
         )
@@ -143,21 +222,8 @@ st.markdown('<div style="height:32px"></div>', unsafe_allow_html=True)
 
 # --- prediction Button ---
 if st.button("🔮 Predict My HDB Price", use_container_width=True):
-    # gather input data for prediction
-    input_df = pd.DataFrame({
-        'floor_area_sqm': [floor_area],
-        'flat_age': [flat_age],
-        'remaining_lease_years': [remaining_lease_years],
-        'flat_type': [flat_type],
-        'town': [town],
-        'flat_model': [flat_model]
-    })
-    
-    # Reindex to match model feature order
-    input_df = input_df.reindex(columns=model.feature_names_in_, fill_value=0)
-
     # make the prediction
-    prediction = model.predict(input_df)[0]  # get the prediction
+    prediction = predict_price(floor_area, flat_age, remaining_lease_years, flat_type, town, flat_model)
     st.markdown(f"""
     <div class="prediction-card">
         <h2>💰 Estimated Resale Price</h2>
@@ -182,7 +248,7 @@ if st.button("🔮 Predict My HDB Price", use_container_width=True):
     """, unsafe_allow_html=True)
 
     # show warning about predictions
-    st.markdown("""
+    st.html("""
     <div class="warning-box">
         <h4>⚠️ Important Disclaimer</h4>
         <p>This is an Machine learned-powered predicted estimate based on historical data. Actual prices may vary due to:
@@ -196,10 +262,10 @@ if st.button("🔮 Predict My HDB Price", use_container_width=True):
             This prediction is just a guide, not an official valuation. For serious buying, selling, or financial decisions, always check with HDB or a licensed property agent.
         </p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
 
 # --- About, Tips, and Contact Section ---
-st.markdown("""
+st.html("""
 <div class="about-section">
     <h3>🤖 About This Tool</h3>
     <p>
@@ -215,11 +281,11 @@ st.markdown("""
         Please do remember that things like renovations or a great view can make a difference. So treat this estimate as a friendly guide, but always chat with HDB or a trusted agent for serious decisions.
     </p>
 </div>
-""", unsafe_allow_html=True)
+""")
 
 # --- Footer with contact info ---
-st.markdown("""
+st.html("""
 <div style="text-align:center; margin-top: 2.5rem; font-size:0.97rem; color: #888;">
-    🏗️ Built for MLDP Project | Trained by Random Forest Machine Learning
+    🏗️ Built for MLDP Project | Trained by Random Forest Machine Learning, distilled into LightGBM
 </div>
-""", unsafe_allow_html=True)
+""")
@@ -0,0 +1,24 @@
+import json
+
+import joblib
+import lightgbm
+from onnxmltools import convert_lightgbm
+from onnxmltools.convert.common.data_types import FloatTensorType
+
+# one-time export of the distilled model (see distill_model.py) to ONNX, which
+# onnxruntime can run on a single row far faster than a Python predict call
+booster = lightgbm.Booster(model_file='hdb_lgbm.txt')
+
+# the app feeds one float32 row in model feature order, named 'X'
+onx = convert_lightgbm(booster, initial_types=[('X', FloatTensorType([None, booster.num_feature()]))])
+
+# keep the feature order with the model so the app can build its input row.
+# LightGBM swaps spaces in feature names for underscores, so take the original
+# names from the RandomForest the student was distilled from
+teacher = joblib.load('randomforestmodel.joblib')
+meta = onx.metadata_props.add()
+meta.key = 'feature_names'
+meta.value = json.dumps(list(teacher.feature_names_in_))
+
+with open('model.onnx', 'wb') as f:
+    f.write(onx.SerializeToString())
@@ -0,0 +1,20 @@
+import pandas as pd
+
+# one-time conversion of the HDB transactions CSV into a Parquet dataset
+# partitioned by town (hdb_ds/town=<TOWN>/), so the app can skip text parsing
+# and only read the files and columns of the town being looked at
+df = pd.read_csv('hdb.csv')
+
+# store 'month' as a proper datetime column so the app doesn't need to parse it
+# (HDB months are always YYYY-MM, so give the format instead of letting pandas guess)
+df['month'] = pd.to_datetime(df['month'], format='%Y-%m', errors='coerce')
+
+# low-cardinality text columns as categories (dictionary encoded on disk)
+for col in ('town', 'flat_type', 'flat_model'):
+    df[col] = df[col].astype('category')
+# smaller numeric types, prices are shown as whole dollars anyway
+df['floor_area_sqm'] = df['floor_area_sqm'].astype('float32')
+df['resale_price'] = df['resale_price'].astype('int32')
+
+# fixed file names so re-running this overwrites the previous output
+df.to_parquet('hdb_ds', index=False, partition_cols=['town'], basename_template='part-{i}.parquet')
@@ -0,0 +1,75 @@
+import joblib
+import lightgbm
+import numpy as np
+import pandas as pd
+
+# one-time distillation of the RandomForest into a much smaller LightGBM model:
+# the student is trained to reproduce the forest's predictions on the same kind
+# of input rows the app builds, so the app's estimates stay close while each
+# prediction walks 200 shallow trees instead of 45 very deep ones
+teacher = joblib.load('randomforestmodel.joblib')
+feature_names = list(teacher.feature_names_in_)
+feat_index = {name: i for i, name in enumerate(feature_names)}
+onehot_cols = {
+    field: [i for name, i in feat_index.items() if name.startswith(f'{field}_')]
+    for field in ('town', 'flat_type', 'flat_model')
+}
+rng = np.random.default_rng(0)
+
+# every historical transaction, encoded the way the app encodes user input
+# (block, street_name and storey_range aren't asked for and stay at 0)
+df = pd.read_csv('hdb.csv')
+X_hist = np.zeros((len(df), len(feature_names)), dtype=np.float32)
+X_hist[:, feat_index['floor_area_sqm']] = df['floor_area_sqm']
+X_hist[:, feat_index['flat_age']] = df['month'].str[:4].astype(int) - df['lease_commence_date']
+X_hist[:, feat_index['remaining_lease_years']] = df['remaining_lease'].str.extract(r'(\d+) years')[0].astype(int)
+for field in onehot_cols:
+    for value in df[field].unique():
+        col = f'{field}_{value}'
+        if col in feat_index:
+            X_hist[(df[field] == value).to_numpy(), feat_index[col]] = 1
+
+
+# random rows over the app's input ranges, so the student also follows the
+# forest on combinations that never appear in the transactions
+def random_rows(n):
+    X = np.zeros((n, len(feature_names)), dtype=np.float32)
+    X[:, feat_index['floor_area_sqm']] = rng.integers(30, 201, n)
+    flat_age = rng.integers(0, 61, n)
+    X[:, feat_index['flat_age']] = flat_age
+    # half as the "Year Built" input computes it, half typed in by hand
+    X[:, feat_index['remaining_lease_years']] = np.where(
+        rng.random(n) < 0.5, np.maximum(1, 99 - flat_age), rng.integers(1, 100, n)
+    )
+    for cols in onehot_cols.values():
+        # one extra choice for the dropped first category (all zeros)
+        choice = rng.integers(0, len(cols) + 1, n)
+        for j, col in enumerate(cols):
+            X[choice == j, col] = 1
+    return X
+
+
+def teacher_predict(X):
+    return teacher.predict(pd.DataFrame(X, columns=feature_names))
+
+
+# hold out some of each kind of row to check how closely the student follows the forest
+order = rng.permutation(len(df))
+hist_train, hist_test = order[:-20000], order[-20000:]
+X_rand_train, X_rand_test = random_rows(200000), random_rows(20000)
+
+X_train = np.vstack([X_hist[hist_train], X_rand_train])
+y_train = np.concatenate([teacher_predict(X_hist[hist_train]), teacher_predict(X_rand_train)])
+
+student = lightgbm.LGBMRegressor(n_estimators=200, max_depth=6, num_leaves=63, verbose=-1)
+student.fit(X_train, y_train, feature_name=feature_names)
+
+y_teacher = teacher_predict(X_hist[hist_test])
+y_student = student.predict(X_hist[hist_test])
+y_actual = df['resale_price'].to_numpy()[hist_test]
+print(f"MAE vs RandomForest (transactions):  ${np.abs(y_student - y_teacher).mean():,.0f}")
+print(f"MAE vs RandomForest (random inputs): ${np.abs(student.predict(X_rand_test) - teacher_predict(X_rand_test)).mean():,.0f}")
+print(f"MAE vs actual price (student):       ${np.abs(y_student - y_actual).mean():,.0f}")
+print(f"MAE vs actual price (RandomForest):  ${np.abs(y_teacher - y_actual).mean():,.0f}")
+
+student.booster_.save_model('hdb_lgbm.txt')